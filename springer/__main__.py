@@ -161,7 +161,10 @@ def list_subcommand(
     ctx: typer.Context,
     component: Component,
     name: str = typer.Option(
-        None, "--name", "-n", help="Name to match against title or pacakge."
+        None,
+        "--name",
+        "-n",
+        help="Text to match against title or package, ignoring case.",
     ),
     long_format: bool = typer.Option(
         False,
@@ -239,7 +242,7 @@ def list_subcommand(
 def refresh_subcommand(
     ctx: typer.Context,
     catalog_url: str = typer.Option(
-        None, "--url", "-u", help="URL for Excel-formatted catalog."
+        None, "--url", "-u", help="URL or local path for Excel-formatted catalog."
     ),
     all_catalogs: bool = typer.Option(False, "--all", is_flag=True),
 ):
@@ -306,11 +309,10 @@ def clean_subcommand(
         typer.secho("The --force switch is required!", fg="red")
         raise typer.Exit(-1)
 
-    if not all_catalogs:
-        ctx.obj.cache_file.unlink()
-        return
+    catalogs = Catalog.all_catalogs() if all_catalogs else [ctx.obj]
 
-    for catalog in Catalog.all_catalogs():
+    for catalog in catalogs:
+        catalog.remove_dataframe_files()
         catalog.cache_file.unlink()
 
 
@@ -339,7 +341,10 @@ def download_subcommand(
     ctx: typer.Context,
     component: Component,
     name: str = typer.Option(
-        None, "--name", "-n", help="Name to match against title or package."
+        None,
+        "--name",
+        "-n",
+        help="Text to match against title or package, ignoring case.",
     ),
     dest_path: Path = typer.Option(
         Path.cwd(),
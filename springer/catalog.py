@@ -1,21 +1,129 @@
 """the Springer Free Textbook Catalog
 """
 
-import pandas
-import toml
+from __future__ import annotations
+
 import typer
-import requests
+import json
+import shutil
 import string
 import sys
 
-from itertools import product
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice, product
 from loguru import logger
-from time import sleep
+from time import monotonic, sleep
 from pathlib import Path
+from tempfile import TemporaryFile
+from threading import Event
+from typing import TYPE_CHECKING
 
 from .constants import FileFormat, Language, Topic, Token
 from .urls import urls as DEFAULT_URLS
 
+# pandas, requests and toml are imported by the methods that use them.
+# Importing pandas alone takes the better part of a second, which every
+# invocation of the command-line tool paid even for `--help`.
+
+if TYPE_CHECKING:
+    import pandas
+    import requests
+
+# Low cardinality catalog columns stored as pandas categories.
+_CATEGORY_COLUMNS = [
+    "package_name",
+    "ebook_package",
+    "language",
+    "language_collection",
+    "subject_classification",
+    "copyright_year",
+    "copyright_holder",
+    "publisher",
+    "imprint",
+    "series_title",
+]
+
+# Translation table used to build column names and filenames from titles,
+# see Catalog.ttable.
+_TTABLE = str.maketrans(
+    {
+        **{p: "" for p in string.punctuation},
+        **{w: "_" for w in string.whitespace},
+        "/": "_",
+        "\\": "_",
+        "™": "",
+        "®": "",
+    }
+)
+
+# Translation table used to build filenames from textbook DOI identifiers.
+_SLASH_AND_DOT_TO_DASH = str.maketrans({"/": "-", ".": "-"})
+
+
+@lru_cache(maxsize=None)
+def _textbook_type(fields: tuple) -> type:
+    """Returns a namedtuple class called 'Textbook' with `fields`."""
+    return namedtuple("Textbook", fields, rename=True)
+
+
+def _textbooks(dataframe: pandas.DataFrame):
+    """Returns an iterator of 'Textbook' namedtuples, one per row in `dataframe`.
+
+    Equivalent to `dataframe.itertuples(index=False, name="Textbook")`,
+    but each column is converted to an array once and the rows are zipped
+    together from the arrays.
+
+    :param dataframe: pandas.DataFrame
+    :return: iterator returning namedtuples called 'Textbook'
+    """
+    Textbook = _textbook_type(tuple(dataframe.columns))
+
+    columns = [dataframe[column].to_numpy() for column in dataframe.columns]
+
+    return map(Textbook._make, zip(*columns))
+
+
+class Packages(Mapping):
+    """A read-only mapping of eBook package names to pandas.DataFrames.
+
+    Package names are read from the categorical package_name column, so
+    counting or listing names never groups the catalog. The row positions
+    of every package are found with a single groupby the first time a
+    package is looked up and a package's dataframe is only sliced out of
+    the catalog dataframe when it is requested.
+    """
+
+    def __init__(self, dataframe: pandas.DataFrame):
+        """
+        :param dataframe: pandas.DataFrame
+        """
+        self.dataframe = dataframe
+        self.names = sorted(dataframe.package_name.dropna().unique())
+
+    @property
+    def indices(self) -> dict:
+        """Dictionary of package names to numpy arrays of row positions."""
+        try:
+            return self._indices
+        except AttributeError:
+            pass
+
+        self._indices = self.dataframe.groupby("package_name", observed=True).indices
+
+        return self._indices
+
+    def __getitem__(self, name: str) -> pandas.DataFrame:
+        return self.dataframe.iloc[self.indices[name]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
 
 class Catalog:
     """Manage Springer's Excel-formated catalogs of textbooks
@@ -34,6 +142,46 @@ class Catalog:
 
     """
 
+    _catalogs = {}
+    _dataframes = {}
+
+    # Number of textbooks downloaded concurrently.
+    workers = 8
+
+    # Connect and read timeouts in seconds for HTTP requests.
+    timeout = (5, 60)
+
+    # Textbooks up to this many bytes are read into memory and written in
+    # one call, larger ones are streamed to disk.
+    small_download = 10 * 1024 * 1024
+
+    # Dictionary result of str.maketrans() for use with str.translate(). This
+    # table collapses punctuation to empty strings and whitespace to an
+    # underscore.
+    ttable = _TTABLE
+
+    @classmethod
+    def get(cls, language: Language, topic: Topic) -> "Catalog":
+        """Returns the Catalog for `language` and `topic`, creating it on first use.
+
+        Catalogs are memoized by (language, topic) so the parsed dataframe
+        of a catalog is shared by every caller in this process.
+
+        Raises KeyError for language/topic combinations which do not exist.
+
+        :param language: springer.constants.Language
+        :param topic: springer.constants.Topic
+        :return: Catalog
+        """
+        try:
+            return cls._catalogs[(language, topic)]
+        except KeyError:
+            pass
+
+        catalog = cls._catalogs[(language, topic)] = cls(language, topic)
+
+        return catalog
+
     @classmethod
     def all_catalogs(cls):
         """Generator classmethod that returns a configured Catalog
@@ -41,7 +189,7 @@ class Catalog:
         """
         for language, topic in product(Language, Topic):
             try:
-                yield cls(language, topic)
+                yield cls.get(language, topic)
             except KeyError:
                 pass
 
@@ -73,7 +221,7 @@ class Catalog:
 
     def __iter__(self):
         """An iterator over all textbooks in a catalog."""
-        return self.textbooks()
+        return _textbooks(self.dataframe)
 
     @property
     def name(self) -> str:
@@ -89,11 +237,15 @@ class Catalog:
     def is_default(self) -> bool:
         """Returns True if this catalog has the default language and topic."""
 
-        # Avoid fetching the Catalog, normally shouldn't be a problem
-        # but can slow down this method if the catalog hasn't been cached
-        # locally yet.
+        # Compare against the defaults directly rather than constructing
+        # the default Catalog just to compare names.
 
-        return Catalog(fetch=False) == self
+        defaults = self.defaults
+
+        return (
+            self.language.value == defaults.get("language", "en")
+            and self.topic.value == defaults.get("topic", "all")
+        )
 
     def __eq__(self, other):
         """Catalogs are equivalent if they have the same name."""
@@ -126,7 +278,7 @@ class Catalog:
         :param file_format: springer.constants.FileFormat
         :return: str
         """
-        return DEFAULT_URLS["content"][file_format] + f"/{uid}.{file_format}"
+        return f"{DEFAULT_URLS['content'][file_format]}/{uid}.{file_format.value}"
 
     @property
     def config_dir(self) -> Path:
@@ -157,23 +309,112 @@ class Catalog:
     @property
     def defaults(self) -> dict:
         """A dictionary loaded from the file `self.defaults_file`.
+
+        The file is parsed once and shared by all Catalog instances,
+        `save_defaults` keeps the loaded dictionary in step with what
+        it writes.
         """
         try:
-            contents = toml.decoder.load(self.defaults_file)
+            return self._defaults
+        except AttributeError:
+            pass
+
+        # The standard library parser is used when available (Python 3.11+),
+        # the toml package is still needed by save_defaults for writing.
+
+        try:
+            from tomllib import loads
+        except ImportError:
+            from toml import loads
+
+        try:
+            Catalog._defaults = loads(self.defaults_file.read_text())
         except FileNotFoundError:
-            contents = {}
-        return contents
+            Catalog._defaults = {}
+
+        return Catalog._defaults
 
     def save_defaults(self) -> None:
         """Saves this instance's langauage and topic values to `defaults_file`.
+
+        The file is written to a temporary sibling and renamed over
+        `defaults_file`, so an interrupted save never leaves a truncated
+        defaults file behind.
         """
+        import toml
+
         updated = {"language": self.language.value, "topic": self.topic.value}
+
+        contents = dict(self.defaults)
+        contents.update(updated)
+
+        staged = self.defaults_file.with_suffix(".toml.tmp")
+        staged.write_text(toml.dumps(contents))
+        staged.replace(self.defaults_file)
+
+        Catalog._defaults = contents
+
+    @property
+    def etags_file(self) -> Path:
+        """Path to the JSON file of ETags for downloaded textbooks."""
+        try:
+            return self._etags_file
+        except AttributeError:
+            pass
+        self._etags_file = self.config_dir / "etags.json"
+        return self._etags_file
+
+    @property
+    def etags(self) -> dict:
+        """A dictionary of textbook paths to ETags loaded from `etags_file`.
+
+        The ETag of each downloaded textbook is recorded so overwriting
+        it later can ask the server to skip sending unchanged content.
+        The dictionary is shared by all Catalog instances and written
+        back to `etags_file` by `save_etags`.
+        """
         try:
-            contents = toml.decoder.load(self.defaults_file)
+            return self._etags
+        except AttributeError:
+            pass
+
+        try:
+            Catalog._etags = json.loads(self.etags_file.read_text())
         except FileNotFoundError:
-            contents = {}
-        contents.update(updated)
-        toml.encoder.dump(contents, self.defaults_file.open("w"))
+            Catalog._etags = {}
+        except ValueError as error:
+            # It's only an optimization, start over rather than fail.
+            logger.debug(f"Ignoring {self.etags_file}: {error!r}")
+            Catalog._etags = {}
+
+        return Catalog._etags
+
+    def save_etags(self) -> None:
+        """Saves `etags` to `etags_file`.
+
+        The file is written to a temporary sibling and renamed over
+        `etags_file`, like `save_defaults`.
+        """
+        staged = self.etags_file.with_suffix(".json.tmp")
+        staged.write_text(json.dumps(self.etags, indent=0, sort_keys=True))
+        staged.replace(self.etags_file)
+
+    def _save_changed_etags(self, previous: dict) -> None:
+        """Saves `etags` if they differ from `previous`.
+
+        Errors are logged rather than raised. The ETags only save
+        bandwidth and shouldn't hide the outcome of the downloads.
+
+        :param previous: dict
+        :return: None
+        """
+        if self.etags == previous:
+            return
+
+        try:
+            self.save_etags()
+        except OSError as error:
+            logger.debug(f"Failed to save {self.etags_file}: {error!r}")
 
     @property
     def cache_file(self) -> Path:
@@ -189,47 +430,92 @@ class Catalog:
         return self._cache_file
 
     @property
-    def ttable(self) -> dict:
-        """Dictionary result of str.maketrans() for use with str.translate().
+    def dataframe_file(self) -> Path:
+        """A pathlib.Path for the locally cached catalog dataframe in pickle format.
+
+        The file name is stamped with the modification time and size of
+        `cache_file`, so a pickle is only ever read for the CSV contents
+        it was built from. This path changes when `cache_file` does and
+        is not memoized.
+        """
+        return self.config_dir / f"catalog-{self.name}.{self._cache_stamp()}.pkl"
+
+    def _cache_stamp(self) -> str:
+        """Returns a string identifying the current contents of `cache_file`.
+
+        :return: str
+        """
+        stat = self.cache_file.stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
 
-        This table collapses punctuation to empty strings and whitespace
-        to an underscore.
+    @property
+    def session(self) -> requests.Session:
+        """A requests.Session used to download textbooks.
+
+        All of the textbooks are served from the same host, so keeping
+        connections alive in a pool saves a TCP and TLS handshake for
+        every textbook after the first. The session is shared by all
+        Catalog instances and its pool holds a connection per worker
+        thread. Failed connections and server errors are retried with
+        an exponential backoff. Once the retries are used up, the last
+        error response is returned rather than raised, so the caller
+        can log it and move on to the next textbook.
         """
         try:
-            return self._ttable
+            return self._session
         except AttributeError:
             pass
 
-        table = {p: "" for p in string.punctuation}
-        table.update({w: "_" for w in string.whitespace})
-        table.update({"/": "_", "\\": "_"})
-        table.update({"™": "", "®": ""})
+        import requests
+
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,
+        )
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=self.workers, max_retries=retry
+        )
 
-        self._ttable = str.maketrans(table)
+        Catalog._session = requests.Session()
+        Catalog._session.mount("https://", adapter)
 
-        return self._ttable
+        return Catalog._session
 
     @property
     def dataframe(self) -> pandas.DataFrame:
         """A pandas.DataFrame populated with the contents of the Springer free textbook catalog.
 
         The dataframe's source data is the cached CSV-formatted file
-        self.`cache_file` and we transform the cached data everytime we
-        construct the dataframe rather than applying it to the cached
-        file. This seemed simpler for handling cached catalog updates.
+        self.`cache_file`, which is left as fetched. The transformed
+        dataframe is pickled to self.`dataframe_file` and later reads
+        load the pickle directly, until `cache_file` is updated.
 
         The source data is modified to make it easier to work with:
 
-        - Empty rows are dropped
+        - Empty columns are dropped
         - Column names are casefolded and embedded spaces replaced with underscores.
         - Column names replaced:
           o english_package_name|german_package_name -> package_name
           o book_title -> title
+        - Columns converted to categories when present: package_name,
+          ebook_package, language, language_collection,
+          subject_classification, copyright_year, copyright_holder,
+          publisher, imprint, series_title
         - Columns added: uid, filename
         - Columns removed: "Unnamed: 0" if present
 
-        Finally, the dataframe is sorted by title and author in
-        ascending order.
+        The rows are sorted by title and author in ascending order,
+        `fetch_catalog` sorts them before writing `cache_file`.
+
+        The transformed dataframe is shared by every Catalog instance
+        reading the same `cache_file` until the file is modified.
+
+        Note: Do not mutate the dataframe unless you copy it.
         """
 
         try:
@@ -237,22 +523,105 @@ class Catalog:
         except AttributeError:
             pass
 
-        if not self.cache_file.exists():
-            self.fetch_catalog()
-
-        df = pandas.read_csv(self.cache_file).dropna(axis=1, how="all")
+        stamp = self._cache_stamp()
 
         try:
-            df.drop(columns="Unnamed: 0", inplace=True)
+            cached_stamp, df = self._dataframes[self.cache_file]
         except KeyError:
+            cached_stamp = None
+
+        if cached_stamp != stamp:
+            df = self._load_dataframe()
+            self._dataframes[self.cache_file] = (stamp, df)
+
+        self._dataframe = df
+
+        return self._dataframe
+
+    def _load_dataframe(self) -> pandas.DataFrame:
+        """Loads the transformed dataframe from `dataframe_file`.
+
+        If there is no pickle for the current contents of `cache_file`,
+        the dataframe is rebuilt from `cache_file` and pickled for the
+        next time.
+
+        :return: pandas.DataFrame
+        """
+        import pandas
+
+        try:
+            return pandas.read_pickle(self.dataframe_file)
+        except FileNotFoundError:
             pass
+        except Exception as error:
+            # The pickle may have been written by a different version of
+            # pandas. It's only a cache, so rebuild it from the CSV.
+            logger.debug(f"Rebuilding {self.dataframe_file}: {error!r}")
+
+        df = self._read_dataframe()
+
+        self._write_dataframe(df)
+
+        return df
+
+    def _write_dataframe(self, df: pandas.DataFrame) -> None:
+        """Pickles `df` to `dataframe_file` and removes stale pickles.
+
+        :param df: pandas.DataFrame
+        :return: None
+        """
+        path = self.dataframe_file
+
+        df.to_pickle(path)
+
+        self.remove_dataframe_files(keep=path)
+
+    def remove_dataframe_files(self, keep: Path = None) -> None:
+        """Removes this catalog's pickled dataframes, except for `keep`.
+
+        Pickles are named for the `cache_file` contents they were built
+        from, so this finds them all rather than just `dataframe_file`.
+
+        :param keep: pathlib.Path
+        :return: None
+        """
+        for path in self.config_dir.glob(f"catalog-{self.name}.*.pkl"):
+            if path != keep:
+                path.unlink()
+
+    def _read_dataframe(self) -> pandas.DataFrame:
+        """Reads `cache_file` and transforms it as described by `dataframe`.
+
+        :return: pandas.DataFrame
+        """
+        import pandas
+
+        # fetch_catalog drops empty columns before writing the cache. Caches
+        # written by older versions start with an unnamed row index column
+        # and may still have empty columns, so only those are scanned here.
+
+        with self.cache_file.open() as fp:
+            legacy = fp.read(1) == ","
+
+        # Every catalog column is text, so skip type inference by reading
+        # them all as strings.
+
+        df = pandas.read_csv(
+            self.cache_file,
+            dtype=str,
+            usecols=lambda column: column != "Unnamed: 0",
+            engine="c",
+        )
+
+        if legacy:
+            df.dropna(axis=1, how="all", inplace=True)
 
         # Normalize column names to make them easier to use. In this case, it
         # means replacing embedded spaces with underscores and casefolding the
         # resultant string. The column names should then be valid python
         # identifiers which makes the dataframe easier to use.
 
-        columns = {c: c.casefold().translate(self.ttable) for c in df.columns}
+        columns = {c: c.casefold().translate(_TTABLE) for c in df.columns}
 
         # later on, textbook.book_title looks funny
         columns["Book Title"] = "title"
@@ -263,37 +632,56 @@ class Catalog:
         # package_name' columns where the English column is empty. Again, to
         # make things easier later on, I conditionally rename
         # 'german_package_name' or 'english_package_name' to 'package_name' and
-        # drop any unused package name columns.
+        # drop any unused package name columns. An empty English column has
+        # usually been dropped already.
 
         if "german_package_name" in df.columns:
             pkg_rename = {"german_package_name": "package_name"}
-            df.drop(columns="english_package_name", inplace=True)
+            df.drop(columns="english_package_name", inplace=True, errors="ignore")
         else:
             pkg_rename = {"english_package_name": "package_name"}
 
         df.rename(columns=pkg_rename, inplace=True)
 
-        # UID = unique identifier in content download URL
-        df["uid"] = df.doi_url.str.lstrip("http://doi.org")
+        # Package names, eBook packages, languages and subjects are repeated
+        # across every book in the catalog. Storing them as categories keeps
+        # one copy of each string and lets groupby work on the integer codes.
+
+        for column in _CATEGORY_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
+
+        # UID = unique identifier in content download URL, the last two
+        # components of the DOI URL. str.lstrip strips a set of characters
+        # rather than a prefix, so extract the components instead.
+        df["uid"] = df.doi_url.str.extract(r"([^/]+/[^/]+)$", expand=False)
 
         # The filename is composed of the title and uid columns with different
         # rules for collapsing punctuation and white space.
 
-        slash_and_dot_to_dash = str.maketrans({"/": "-", ".": "-",})
+        # A single list comprehension over the column arrays avoids the
+        # intermediate Series two .str.translate calls and .str.cat create.
+        # Rows missing a title or a usable DOI URL get no filename, rather
+        # than breaking the whole catalog.
 
-        df["filename"] = (
-            df["title"]
-            .str.translate(self.ttable)
-            .str.cat(df.uid.str.translate(slash_and_dot_to_dash), sep="-",)
-        )
+        df["filename"] = [
+            f"{title.translate(_TTABLE)}-{uid.translate(_SLASH_AND_DOT_TO_DASH)}"
+            if isinstance(title, str) and isinstance(uid, str)
+            else None
+            for title, uid in zip(df.title.to_numpy(), df.uid.to_numpy())
+        ]
 
-        self._dataframe = df.sort_values(by=["title", "author"], ascending=[True, True])
+        # fetch_catalog writes the cache sorted, only caches written by older
+        # versions still need sorting here.
 
-        return self._dataframe
+        if not df.title.is_monotonic_increasing:
+            df = df.sort_values(by=["title", "author"], ascending=[True, True])
+
+        return df
 
     @property
-    def packages(self) -> dict:
-        """Dictionary of pandas.DataFrames values whose keys are eBook package names.
+    def packages(self) -> Packages:
+        """Mapping of pandas.DataFrames values whose keys are eBook package names.
         
         Keys are in sorted order.
 
@@ -304,37 +692,104 @@ class Catalog:
         except AttributeError:
             pass
 
-        self._packages = {
-            name: pkg for name, pkg in self.dataframe.groupby("package_name")
-        }
+        self._packages = Packages(self.dataframe)
+
         return self._packages
 
+    def _contains(self, column: str, text: str) -> pandas.Series:
+        """A boolean mask of rows whose `column` contains `text`, ignoring case.
+
+        The casefolded copy of `column` is computed once per catalog and
+        reused for subsequent searches. Matching is a plain substring test
+        rather than a regular expression and missing values never match.
+
+        :param column: str
+        :param text: str
+        :return: pandas.Series
+        """
+        try:
+            casefolded = self._casefolded
+        except AttributeError:
+            casefolded = self._casefolded = {}
+
+        try:
+            values = casefolded[column]
+        except KeyError:
+            values = casefolded[column] = self.dataframe[column].str.casefold()
+
+        return values.str.contains(text.casefold(), regex=False, na=False)
+
     def fetch_catalog(self, url: str = None) -> None:
         """Reads the Excel file at `url` and writes it to the local filesystem.
 
         The Excel file is written to `cache_file` in CSV format. If
         `url` is not given, `self.url` is used.
 
+        HTTP(S) URLs are streamed to a temporary file with `session`
+        and parsed from there, rather than held in memory as a response
+        body while pandas parses it. Any other `url`, such as a local
+        path or a file:// URL, is read by pandas directly.
+
+        Empty columns are dropped, rows are sorted by title and author
+        and the row index is not written, so this work happens once per
+        fetch instead of every time the cache file is read. The
+        transformed dataframe is written to `dataframe_file` as well.
+
         :param url: str
         :return: None
         """
+        import pandas
+
+        url = url or self.url
+
         # XXX update defaults with new url if one is given and it succeeds?
-        pandas.read_excel(url or self.url).to_csv(self.cache_file)
+        if url.lower().startswith(("https://", "http://")):
+            with TemporaryFile(suffix=".xlsx") as workbook:
+                with self.session.get(
+                    url, stream=True, timeout=self.timeout
+                ) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, workbook, 1024 * 1024)
+                workbook.seek(0)
+                df = pandas.read_excel(workbook)
+        else:
+            df = pandas.read_excel(url)
+
+        df = df.dropna(axis=1, how="all")
+        df.sort_values(by=["Book Title", "Author"], inplace=True)
+
+        df.to_csv(self.cache_file, index=False)
+
+        # Catalogs are memoized, forget anything derived from the old cache.
+        for attribute in ["_dataframe", "_packages", "_casefolded"]:
+            self.__dict__.pop(attribute, None)
 
-    def textbooks(self, dataframe: pandas.DataFrame = None) -> tuple:
-        """This generator function returns a namedtuple for each row in `dataframe`.
+        # Build and pickle the transformed dataframe now, so the next read
+        # of this catalog in this process or a later one skips the CSV.
 
-        If `dataframe` is got supplied, `self.dataframe` is used.
+        df = self._read_dataframe()
+        self._write_dataframe(df)
+
+        self._dataframes[self.cache_file] = (self._cache_stamp(), df)
+
+    def textbooks(self, dataframe: pandas.DataFrame = None):
+        """Returns an iterator of namedtuples, one for each row in `dataframe`.
+
+        If `dataframe` is not supplied, `self.dataframe` is used.
+
+        Rows are built by zipping the dataframe's column arrays rather
+        than re-yielded from a generator, which saves a Python frame per
+        textbook in the list and download loops.
 
         :param dataframe: pandas.DataFrame
-        :return: generator returning namedtuples called 'TextBook'
+        :return: iterator returning namedtuples called 'Textbook'
         """
 
         if dataframe is None:
             dataframe = self.dataframe
 
-        for textbook in dataframe.itertuples(index=None, name="Textbook"):
-            yield textbook
+        return _textbooks(dataframe)
 
     def download_textbook(
         self, textbook: tuple, dest: Path, file_format: FileFormat, overwrite: bool,
@@ -351,6 +806,11 @@ class Catalog:
         entry for that textbook will be logged to the download report and
         zero bytes written is returned.
 
+        If the destination path exists and overwrite is True, the ETag
+        recorded in `etags` when it was downloaded is sent with the
+        request. If the server answers that the textbook is unchanged,
+        the file is left alone and zero bytes written is returned.
+
         If the textbook fails to download, an entry is logged to the
         download report with the HTTP status code and URL of the
         attemtped textbook. Again, zero bytes written is returned to
@@ -360,10 +820,13 @@ class Catalog:
         filesystem. The path to save the data is constructed using
         `dest`, the textbook.filename field and `file_format`.suffix.
 
-        If the user interrupts saving the file to the local filesystem,
-        the partial file is removed and the path is logged to the
-        download report. The intention is to avoid leaving a truncated
-        file for the user to trip on later. Not a delighter.
+        The data is written to a ".part" file next to the destination
+        path which is renamed to the destination path once the download
+        completes. If saving the file is interrupted for any reason, the
+        partial file is removed and the path is logged to the download
+        report. The intention is to avoid leaving a truncated file for
+        the user to trip on later, or for a later run to mistake for a
+        completed download. Not a delighter.
 
         The number of bytes written to the local filesystem is returned.
 
@@ -373,40 +836,99 @@ class Catalog:
         :param overwrite: bool
         :return: int <bytes written>
 
-        Raises:
-        - ValueError for missing Textbook attributes
+        If the textbook has no filename because its title or DOI URL is
+        missing from the catalog, a skipped entry is logged and zero bytes
+        written is returned.
 
         """
 
-        path = (dest / textbook.filename).with_suffix(file_format.suffix)
-
-        if not overwrite and path.exists():
-            logger.debug(f"Skipped {path}")
+        if not isinstance(textbook.filename, str):
+            logger.debug(f"Skipped {textbook.title}: missing title or DOI URL")
             return 0
 
+        path = dest / f"{textbook.filename}{file_format.suffix}"
+
         url = self.content_url(textbook.uid, file_format)
 
-        response = requests.get(url, stream=True)
+        etags = dict(self.etags)
+
+        try:
+            return self._download(url, path, overwrite)
+        finally:
+            self._save_changed_etags(etags)
+
+    def _download(
+        self, url: str, path: Path, overwrite: bool, cancelled: Event = None
+    ) -> int:
+        """Download `url` to `path`, see `download_textbook`.
+
+        The URL and path are resolved by the caller, so this does no
+        per-textbook work with `file_format`. If `cancelled` is set
+        while the textbook is streamed to disk, the download stops and
+        the partial file is removed.
 
-        if not response:
-            logger.debug(f"{response} {url}")
+        :param url: str
+        :param path: pathlib.Path
+        :param overwrite: bool
+        :param cancelled: threading.Event
+        :return: int <bytes written>
+        """
+
+        exists = path.exists()
+
+        if not overwrite and exists:
+            logger.debug(f"Skipped {path}")
             return 0
 
-        try:
-            size = 0
-            with path.open("wb") as fp:
-                for chunk in response.iter_content(chunk_size=8192):
-                    size += len(chunk)
-                    fp.write(chunk)
-            return size
-        except KeyboardInterrupt:
-            # EJO The user has aborted the download and we don't want to leave
-            #     a partially downloaded file to upset them later. Remove the
-            #     partial file, issue a log entry with the aborted path and
-            #     re-raise the exception.
-            path.unlink()
-            logger.debug(f"User aborted, removed partial file: {path}")
-            raise
+        # Only ask for a conditional download of a file we still have.
+        key = str(path.absolute())
+        etag = self.etags.get(key) if exists else None
+        headers = {"If-None-Match": etag} if etag else None
+
+        partial = path.with_suffix(path.suffix + ".part")
+
+        with self.session.get(
+            url, stream=True, timeout=self.timeout, headers=headers
+        ) as response:
+
+            if response.status_code == 304:
+                logger.debug(f"Unchanged {path}")
+                return 0
+
+            if not response:
+                logger.debug(f"{response} {url}")
+                return 0
+
+            length = response.headers.get("Content-Length", "")
+
+            try:
+                if length.isdigit() and int(length) <= self.small_download:
+                    size = partial.write_bytes(response.content)
+                else:
+                    with partial.open("wb") as fp:
+                        # Copy from the raw response in 1 MiB blocks rather
+                        # than looping over small chunks in Python, checking
+                        # between blocks whether the batch was cancelled.
+                        response.raw.decode_content = True
+                        for block in iter(
+                            lambda: response.raw.read(1024 * 1024), b""
+                        ):
+                            if cancelled is not None and cancelled.is_set():
+                                return 0
+                            fp.write(block)
+                        size = fp.tell()
+                partial.replace(path)
+                if "ETag" in response.headers:
+                    self.etags[key] = response.headers["ETag"]
+                return size
+            finally:
+                # If the user aborted the download, the connection dropped
+                # or the disk filled up, we don't want to leave a partially
+                # downloaded file to upset them later. Remove the partial
+                # file and issue a log entry with the aborted path.
+                if partial.exists():
+                    partial.unlink()
+                    logger.debug(f"Download aborted, removed partial file: {partial}")
 
     def download_dataframe(
         self,
@@ -418,10 +940,15 @@ class Catalog:
     ) -> int:
         """Downloads all the textbooks in `dataframe` to `dest` with format `file_format`.
 
+        Textbooks are downloaded concurrently by `workers` threads which
+        share the connection pool of `session`. A progress bar is shown
+        if there is more than one textbook or `animated` is True.
+
         :param dest: pathlib.path
         :param file_format: springer.constants.FileFormat
         :param overwrite: bool
         :param dataframe: pandas.DataFrame
+        :param animated: bool
         :return: <bytes written>
         """
 
@@ -433,12 +960,94 @@ class Catalog:
                 dest, file_format, overwrite, dataframe
             )
 
-        total = 0
-        for textbook in self.textbooks(dataframe):
-            total += self.download_textbook(
-                textbook, dest, file_format, overwrite=overwrite
-            )
-        return total
+        downloads = self._download_textbooks(dest, file_format, overwrite, dataframe)
+
+        return sum(size for _, size in downloads)
+
+    def _download_textbooks(
+        self,
+        dest: Path,
+        file_format: FileFormat,
+        overwrite: bool,
+        dataframe: pandas.DataFrame,
+    ):
+        """Generator that downloads the textbooks in `dataframe` concurrently.
+
+        Downloads are spread over `workers` threads sharing `session`. A
+        (textbook, bytes written) tuple is yielded as each download
+        completes, which is not necessarily the order of `dataframe`.
+        Rows missing a title or DOI URL are logged and yielded with zero
+        bytes written, without being downloaded.
+
+        If the consumer stops early or an exception is raised, downloads
+        that have not started yet are cancelled. Downloads in progress stop
+        at their next block and remove their partial files. The ETags
+        of the downloaded textbooks are saved with `save_etags` when the
+        generator finishes, if any changed.
+
+        :param dest: pathlib.path
+        :param file_format: springer.constants.FileFormat
+        :param overwrite: bool
+        :param dataframe: pandas.DataFrame
+        :return: generator returning (namedtuple, int) tuples
+        """
+
+        # Rows missing a title or DOI URL have no filename to save to or
+        # URL to download from. Skip them up front, rather than failing in
+        # the middle of the batch.
+        missing = dataframe.filename.isna()
+        if missing.any():
+            for textbook in self.textbooks(dataframe[missing]):
+                logger.debug(f"Skipped {textbook.title}: missing title or DOI URL")
+                yield textbook, 0
+            dataframe = dataframe[~missing]
+
+        # Build every content URL and filename in a couple of vectorized
+        # string operations rather than formatting them per textbook.
+        extension = f".{file_format.value}"
+        urls = DEFAULT_URLS["content"][file_format] + "/" + dataframe.uid + extension
+        filenames = dataframe.filename + extension
+
+        work = zip(self.textbooks(dataframe), urls.to_numpy(), filenames.to_numpy())
+
+        cancelled = Event()
+
+        # The session and ETags are shared by all catalogs and created on
+        # first use. Create them here, before any worker thread needs them,
+        # so two workers can't each create their own.
+        self.session
+        etags = dict(self.etags)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+                def submit(count: int) -> None:
+                    for textbook, url, filename in islice(work, count):
+                        future = executor.submit(
+                            self._download, url, dest / filename, overwrite, cancelled
+                        )
+                        pending[future] = textbook
+
+                # Keep a couple of downloads queued per worker rather than
+                # submitting the whole dataframe up front. Rows are turned
+                # into textbooks as downloads complete and there are never
+                # more than a handful of futures to cancel.
+                pending = {}
+                try:
+                    submit(self.workers * 2)
+                    while pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        submit(len(done))
+                        for future in done:
+                            yield pending.pop(future), future.result()
+                except BaseException:
+                    cancelled.set()
+                    for future in pending:
+                        future.cancel()
+                    raise
+        finally:
+            # Record ETags for whatever was downloaded, even if interrupted.
+            self._save_changed_etags(etags)
 
     def download_dataframe_animated(
         self,
@@ -465,7 +1074,6 @@ class Catalog:
             return item.title[:20]
 
         with typer.progressbar(
-            self.textbooks(dataframe),
             length=len(dataframe),
             label=f"{self.name}:{file_format:4s}",
             show_percent=False,
@@ -474,12 +1082,32 @@ class Catalog:
             empty_char=Token.Empty,
             fill_char=Token.Book,
             item_show_func=show_title,
-        ) as workitems:
+        ) as progress:
+            # Redrawing the bar for every completed download is
+            # wasted terminal I/O when downloads finish in bursts, so
+            # completions are batched and the bar redrawn at most every
+            # `redraw` seconds.
             total = 0
-            for textbook in workitems:
-                total += self.download_textbook(
-                    textbook, dest, file_format, overwrite=overwrite
-                )
+            steps = 0
+            redrawn = 0.0
+            redraw = 0.1
+            for textbook, size in self._download_textbooks(
+                dest, file_format, overwrite, dataframe
+            ):
+                total += size
+                steps += 1
+                if monotonic() - redrawn >= redraw:
+                    progress.current_item = textbook
+                    progress.update(steps)
+                    steps = 0
+                    redrawn = monotonic()
+            if steps:
+                progress.current_item = None
+                progress.update(steps)
+            # The bar is advanced by hand rather than iterated, so finish it
+            # explicitly to draw the "Downloaded to" label on the last frame.
+            progress.finish()
+            progress.render_progress()
             return total
 
     def download_title(self, title: str, dest: Path, file_format, overwrite: bool):
@@ -494,7 +1122,7 @@ class Catalog:
         Raises KeyError if the requested title does not match any textbook titles.
         """
 
-        df = self.dataframe[self.dataframe.title.str.contains(title, case=False)]
+        df = self.dataframe[self._contains("title", title)]
 
         if df.empty:
             raise KeyError(f"No matches for requested title '{title}'")
@@ -515,9 +1143,7 @@ class Catalog:
         Raises KeyError if the requested package does not match any package names.
         """
 
-        df = self.dataframe[
-            self.dataframe.package_name.str.contains(package, case=False)
-        ]
+        df = self.dataframe[self._contains("package_name", package)]
 
         if df.empty:
             raise KeyError(f"No matches for requested package '{package}'")
@@ -527,6 +1153,9 @@ class Catalog:
     def download(self, dest: Path, file_format: FileFormat, overwrite: bool,) -> int:
         """Download all the textbooks in this catalog to `dest` with format `file_format`.
 
+        Textbooks are downloaded concurrently by `workers` threads which
+        share the connection pool of `session`.
+
         :param dest: pathlib.path
         :param file_format: springer.constants.FileFormat
         :param overwrite: bool
@@ -543,18 +1172,29 @@ class Catalog:
         :param long_format: bool
         """
 
-        for textbook in self.textbooks(dataframe):
+        # Pull each column out of the dataframe as an array once and
+        # zip the arrays together, rather than building a namedtuple
+        # and an OrderedDict for every row just to walk its fields. The
+        # lines for all the books are written to stdout at once.
 
-            lines = []
+        keys = [column.replace("_", " ").title() for column in dataframe.columns]
+        isbns = dataframe.electronic_isbn.to_numpy()
 
-            for key, value in textbook._asdict().items():
-                key = key.replace("_", " ").title()
-                lines.append(f"{Token.Book}|{textbook.electronic_isbn}|{key}|{value}")
-            lines.append(f"{Token.Stop}{lines[0][1:]}")
-            if not long_format:
-                lines = lines[:1]
+        if not long_format:
+            values = dataframe[dataframe.columns[0]].to_numpy()
+            lines = [
+                f"{Token.Book}|{isbn}|{keys[0]}|{value}"
+                for isbn, value in zip(isbns, values)
+            ]
+        else:
+            columns = [dataframe[column].to_numpy() for column in dataframe.columns]
+            lines = []
+            for isbn, row in zip(isbns, zip(*columns)):
+                lines.extend(f"{Token.Book}|{isbn}|{k}|{v}" for k, v in zip(keys, row))
+                lines.append(f"{Token.Stop}|{isbn}|{keys[0]}|{row[0]}")
 
-            print("\n".join(lines))
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
     def list_textbooks(self, long_format: bool, match: str = None) -> None:
         """Displays all books in a catalog.
@@ -564,9 +1204,7 @@ class Catalog:
         """
 
         if match:
-            source = self.dataframe[
-                self.dataframe.title.str.contains(match, case=False)
-            ]
+            source = self.dataframe[self._contains("title", match)]
         else:
             source = self.dataframe
 
@@ -1,13 +1,19 @@
 """
 """
 
+import io
+import os
 import pytest
+import typer
 
+from collections.abc import Mapping
 from pathlib import Path
 from pandas import DataFrame
+from requests import Response, Session
+from threading import Event
 
 from springer.catalog import Catalog
-from springer.constants import Language, Topic
+from springer.constants import FileFormat, Language, Token, Topic
 
 
 @pytest.fixture(scope="module")
@@ -15,6 +21,63 @@ def CATALOG():
     return Catalog()
 
 
+@pytest.fixture
+def CONFIG_DIR(tmp_path, monkeypatch):
+    """Catalogs created during the test use an empty configuration directory."""
+    monkeypatch.setattr(typer, "get_app_dir", lambda name: str(tmp_path))
+    monkeypatch.delattr(Catalog, "_defaults", raising=False)
+    return tmp_path
+
+
+class FakeSession:
+    """Stands in for Catalog.session, serving canned responses by URL.
+
+    `responses` maps a URL to a callable returning a requests.Response,
+    the headers sent with each request are recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        return self.responses[url]()
+
+
+def make_response(status: int = 200, body: bytes = b"", headers: dict = None):
+    """Returns a requests.Response with `status`, `body` and `headers`."""
+    response = Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def SESSION(CONFIG_DIR, monkeypatch):
+    """Catalogs download through a FakeSession and start with no ETags."""
+    session = FakeSession()
+    monkeypatch.setattr(Catalog, "_session", session, raising=False)
+    monkeypatch.setattr(Catalog, "_etags", {}, raising=False)
+    return session
+
+
+DOI_URLS = [f"http://doi.org/10.1007/978-3-319-0000{n}-{n}" for n in range(3)]
+
+
+def write_catalog(path: Path, rows: list, legacy: bool = False) -> None:
+    """Writes a minimal catalog CSV file with (title, author, package, doi_url) rows.
+
+    Legacy catalog files have a leading row index column and an empty column.
+    """
+    columns = ["Book Title", "Author", "English Package Name", "DOI URL"]
+    df = DataFrame(rows, columns=columns)
+    if legacy:
+        df["Empty"] = None
+    df.to_csv(path, index=legacy)
+
+
 def test_creating_catalog_no_args():
 
     catalog = Catalog()
@@ -59,10 +122,14 @@ def test_creating_catalog_with_args_xfail(lang, cat):
         ("config_dir", Path),
         ("defaults_file", Path),
         ("defaults", dict),
+        ("etags_file", Path),
+        ("etags", dict),
         ("cache_file", Path),
+        ("dataframe_file", Path),
+        ("session", Session),
         ("ttable", dict),
         ("dataframe", DataFrame),
-        ("packages", dict),
+        ("packages", Mapping),
     ],
 )
 def test_catalog_property_existence_and_type(prop_name, prop_type, CATALOG):
@@ -71,6 +138,11 @@ def test_catalog_property_existence_and_type(prop_name, prop_type, CATALOG):
     assert isinstance(value, prop_type)
 
 
+def test_catalog_dataframe_has_no_empty_columns(CATALOG):
+
+    assert not CATALOG.dataframe.isna().all().any()
+
+
 @pytest.mark.parametrize(
     "method_name",
     [
@@ -79,8 +151,11 @@ def test_catalog_property_existence_and_type(prop_name, prop_type, CATALOG):
         "__iter__",
         "__eq__",
         "all_catalogs",
+        "get",
         "content_url",
         "save_defaults",
+        "save_etags",
+        "remove_dataframe_files",
         "fetch_catalog",
         "textbooks",
         "download_textbook",
@@ -106,3 +181,360 @@ def test_catalog_classmethod_all_catalogs():
 
     for catalog in Catalog.all_catalogs():
         assert isinstance(catalog, Catalog)
+
+
+def test_catalog_classmethod_get_is_memoized():
+
+    catalog = Catalog.get(Language.English, Topic.All_Disciplines)
+    assert catalog is Catalog.get(Language.English, Topic.All_Disciplines)
+    assert any(c is catalog for c in Catalog.all_catalogs())
+
+
+def test_catalog_dataframe_tolerates_missing_doi_url(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(
+        catalog.cache_file,
+        [
+            ("A Title", "A. Author", "Pkg", DOI_URLS[0]),
+            ("B Title", "B. Author", "Pkg", None),
+            ("C Title", "C. Author", "Pkg", DOI_URLS[2]),
+        ],
+    )
+
+    df = catalog.dataframe
+    assert len(df) == 3
+    assert df.filename.isna().tolist() == [False, True, False]
+
+    for uid in df.uid.dropna():
+        url = catalog.content_url(uid, FileFormat.pdf)
+        SESSION.responses[url] = lambda: make_response(200, b"PDF")
+
+    dest = tmp_path / "books"
+    dest.mkdir()
+
+    assert catalog.download_dataframe(dest, FileFormat.pdf, False) == 6
+    assert sorted(path.name for path in dest.iterdir()) == [
+        f"{filename}.pdf" for filename in df.filename.dropna()
+    ]
+
+    missing = next(catalog.textbooks(df[df.filename.isna()]))
+    assert catalog.download_textbook(missing, dest, FileFormat.pdf, False) == 0
+    assert len(SESSION.requests) == 2
+
+
+def test_catalog_session_returns_error_responses_after_retries(CONFIG_DIR):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    retry = catalog.session.get_adapter("https://").max_retries
+    assert retry.total
+    assert not retry.raise_on_status
+
+
+def test_catalog_download_continues_past_failed_textbook(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(
+        catalog.cache_file,
+        [(f"Title {n}", "Author", "Pkg", url) for n, url in enumerate(DOI_URLS)],
+    )
+    for n, uid in enumerate(catalog.dataframe.uid):
+        status = 503 if n == 1 else 200
+        url = catalog.content_url(uid, FileFormat.pdf)
+        SESSION.responses[url] = lambda status=status: make_response(status, b"PDF")
+
+    dest = tmp_path / "books"
+    dest.mkdir()
+
+    assert catalog.download_dataframe(dest, FileFormat.pdf, False) == 6
+    assert len(SESSION.requests) == 3
+    assert len(list(dest.glob("*.pdf"))) == 2
+
+
+def test_catalog_download_stops_when_cancelled(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    SESSION.responses[url] = lambda: make_response(200, b"PDF")
+    path = tmp_path / "book.pdf"
+    cancelled = Event()
+    cancelled.set()
+
+    assert catalog._download(url, path, False, cancelled) == 0
+    assert not path.exists()
+    assert not path.with_suffix(".pdf.part").exists()
+
+
+def test_catalog_download_leaves_etags_file_alone_when_unchanged(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(catalog.cache_file, [("Title", "Author", "Pkg", DOI_URLS[0])])
+    dest = tmp_path / "books"
+    dest.mkdir()
+    (dest / f"{catalog.dataframe.filename.iloc[0]}.pdf").write_bytes(b"PDF")
+
+    assert catalog.download_dataframe(dest, FileFormat.pdf, False) == 0
+    assert not SESSION.requests
+    assert not catalog.etags_file.exists()
+
+
+def test_catalog_download_sends_recorded_etag_when_overwriting(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    path = tmp_path / "book.pdf"
+    etag = {"ETag": '"v1"'}
+
+    SESSION.responses[url] = lambda: make_response(200, b"PDF", etag)
+    assert catalog._download(url, path, False) == 3
+    assert catalog.etags[str(path.absolute())] == '"v1"'
+
+    SESSION.responses[url] = lambda: make_response(304, b"", etag)
+    assert catalog._download(url, path, True) == 0
+    assert SESSION.requests[-1] == (url, {"If-None-Match": '"v1"'})
+    assert path.read_bytes() == b"PDF"
+
+
+def test_catalog_download_sends_no_etag_for_deleted_file(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    path = tmp_path / "book.pdf"
+
+    SESSION.responses[url] = lambda: make_response(200, b"PDF", {"ETag": '"v1"'})
+    catalog._download(url, path, False)
+    path.unlink()
+
+    assert catalog._download(url, path, True) == 3
+    assert SESSION.requests[-1] == (url, None)
+    assert path.read_bytes() == b"PDF"
+
+
+class DroppedConnection(io.BytesIO):
+    """A response body that fails after the first block is read."""
+
+    def read(self, size=-1):
+        if self.tell():
+            raise ConnectionError("connection dropped")
+        return super().read(4)
+
+
+def test_catalog_download_removes_partial_file_on_failure(SESSION, tmp_path):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    path = tmp_path / "book.pdf"
+
+    def dropped():
+        response = make_response(200)
+        response.raw = DroppedConnection(b"PDF-PDF-PDF")
+        return response
+
+    SESSION.responses[url] = dropped
+    with pytest.raises(ConnectionError):
+        catalog._download(url, path, False)
+    assert not path.exists()
+    assert not path.with_suffix(".pdf.part").exists()
+
+    SESSION.responses[url] = lambda: make_response(200, b"PDF")
+    assert catalog._download(url, path, False) == 3
+    assert path.read_bytes() == b"PDF"
+
+
+def test_catalog_dataframe_loads_from_pickle(CONFIG_DIR, monkeypatch):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(catalog.cache_file, [("Title", "Author", "Pkg", DOI_URLS[0])])
+    expected = catalog.dataframe
+    assert catalog.dataframe_file.exists()
+
+    monkeypatch.delitem(Catalog._dataframes, catalog.cache_file)
+    monkeypatch.setattr(Catalog, "_read_dataframe", None)
+
+    second = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    assert second.dataframe.equals(expected)
+
+
+def test_catalog_dataframe_pickle_follows_catalog_file(CONFIG_DIR):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(catalog.cache_file, [("Title", "Author", "Pkg", DOI_URLS[0])])
+    catalog.dataframe
+    pickles = [catalog.dataframe_file]
+
+    rows = [(f"Title {n}", "Author", "Pkg", url) for n, url in enumerate(DOI_URLS)]
+    write_catalog(catalog.cache_file, rows)
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    assert len(catalog.dataframe) == 3
+    pickles.append(catalog.dataframe_file)
+
+    stat = catalog.cache_file.stat()
+    os.utime(catalog.cache_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    assert len(catalog.dataframe) == 3
+    pickles.append(catalog.dataframe_file)
+
+    assert len(set(pickles)) == 3
+    assert list(CONFIG_DIR.glob("*.pkl")) == [pickles[-1]]
+
+
+def test_catalog_dataframe_reads_legacy_catalog_file(CONFIG_DIR):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    rows = [(f"Title {n}", "Author", "Pkg", url) for n, url in enumerate(DOI_URLS)]
+    write_catalog(catalog.cache_file, rows[::-1], legacy=True)
+    assert catalog.cache_file.read_text().startswith(",")
+
+    df = catalog.dataframe
+    assert "empty" not in df.columns
+    assert not any(column.startswith("unnamed") for column in df.columns)
+    assert df.title.tolist() == ["Title 0", "Title 1", "Title 2"]
+
+
+@pytest.mark.parametrize("as_uri", [False, True])
+def test_catalog_fetch_catalog_from_local_file(as_uri, CONFIG_DIR, tmp_path):
+
+    pytest.importorskip("openpyxl")
+
+    rows = [(f"Title {n}", "Author", "Pkg", url) for n, url in enumerate(DOI_URLS)]
+    workbook = tmp_path / "catalog.xlsx"
+    DataFrame(
+        rows[::-1], columns=["Book Title", "Author", "English Package Name", "DOI URL"]
+    ).to_excel(workbook, index=False)
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    catalog.fetch_catalog(workbook.as_uri() if as_uri else str(workbook))
+
+    assert catalog.dataframe.title.tolist() == ["Title 0", "Title 1", "Title 2"]
+
+
+def test_catalog_remove_dataframe_files_after_catalog_file_changes(CONFIG_DIR):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(catalog.cache_file, [("Title", "Author", "Pkg", DOI_URLS[0])])
+    catalog.dataframe
+    pickle = catalog.dataframe_file
+
+    stat = catalog.cache_file.stat()
+    os.utime(catalog.cache_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert catalog.dataframe_file != pickle
+
+    catalog.remove_dataframe_files()
+    assert not list(CONFIG_DIR.glob("*.pkl"))
+
+
+@pytest.mark.parametrize(
+    "length,streamed",
+    [("3", False), (str(Catalog.small_download), False), ("unknown", True)],
+)
+def test_catalog_download_writes_by_content_length(
+    length, streamed, SESSION, tmp_path
+):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    path = tmp_path / "book.pdf"
+    response = make_response(200, b"PDF", {"Content-Length": length, "ETag": '"v1"'})
+    SESSION.responses[url] = lambda: response
+
+    assert catalog._download(url, path, False) == 3
+    assert path.read_bytes() == b"PDF"
+    assert not path.with_suffix(".pdf.part").exists()
+    assert catalog.etags[str(path.absolute())] == '"v1"'
+    # Only the streaming copy sets decode_content on the raw response.
+    assert hasattr(response.raw, "decode_content") == streamed
+
+
+def test_catalog_download_streams_large_textbook(SESSION, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(Catalog, "small_download", 2)
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    url = "https://example.com/book.pdf"
+    path = tmp_path / "book.pdf"
+    response = make_response(200, b"PDF", {"Content-Length": "3"})
+    SESSION.responses[url] = lambda: response
+
+    assert catalog._download(url, path, False) == 3
+    assert path.read_bytes() == b"PDF"
+    assert response.raw.decode_content
+
+
+def test_catalog_save_defaults_is_seen_by_other_instances(CONFIG_DIR):
+
+    try:
+        from tomllib import loads
+    except ImportError:
+        from toml import loads
+
+    english = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    assert english.is_default
+
+    Catalog(Language.German, Topic.Emergency_Nursing, fetch=False).save_defaults()
+
+    german = Catalog(Language.German, Topic.Emergency_Nursing, fetch=False)
+    assert german.is_default
+    assert not english.is_default
+    assert loads(german.defaults_file.read_text()) == {
+        "language": Language.German.value,
+        "topic": Topic.Emergency_Nursing.value,
+    }
+    assert not list(CONFIG_DIR.glob("*.tmp"))
+
+
+def test_catalog_name_matching_is_literal_and_ignores_case(CONFIG_DIR):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    write_catalog(
+        catalog.cache_file,
+        [
+            ("Intro to C++ (2nd Ed.)", "Author", "Computer Science", DOI_URLS[0]),
+            ("Python Programming", "Author", "Engineering", DOI_URLS[1]),
+            (None, "Author", "Engineering", DOI_URLS[2]),
+        ],
+    )
+
+    def matches(column, text):
+        mask = catalog._contains(column, text)
+        return catalog.dataframe[column][mask].tolist()
+
+    assert catalog.dataframe.package_name.dtype == "category"
+    assert matches("title", "PYTHON") == ["Python Programming"]
+    assert matches("title", "c++ (2nd") == ["Intro to C++ (2nd Ed.)"]
+    assert matches("title", "^Intro") == []
+    assert matches("title", "o") == ["Intro to C++ (2nd Ed.)", "Python Programming"]
+    assert matches("package_name", "engineering") == ["Engineering", "Engineering"]
+
+
+@pytest.mark.parametrize("long_format", [False, True])
+def test_catalog_list_dataframe_output(long_format, CONFIG_DIR, capsys):
+
+    catalog = Catalog(Language.English, Topic.All_Disciplines, fetch=False)
+    df = DataFrame(
+        {
+            "title": ["A Title", "B Title"],
+            "author": ["A. Author", "B. Author"],
+            "electronic_isbn": ["978-3-319-00000-0", "978-3-319-00001-1"],
+        }
+    )
+
+    catalog.list_dataframe(df, long_format)
+
+    book, stop = Token.Book, Token.Stop
+    if long_format:
+        expected = [
+            f"{book}|978-3-319-00000-0|Title|A Title",
+            f"{book}|978-3-319-00000-0|Author|A. Author",
+            f"{book}|978-3-319-00000-0|Electronic Isbn|978-3-319-00000-0",
+            f"{stop}|978-3-319-00000-0|Title|A Title",
+            f"{book}|978-3-319-00001-1|Title|B Title",
+            f"{book}|978-3-319-00001-1|Author|B. Author",
+            f"{book}|978-3-319-00001-1|Electronic Isbn|978-3-319-00001-1",
+            f"{stop}|978-3-319-00001-1|Title|B Title",
+        ]
+    else:
+        expected = [
+            f"{book}|978-3-319-00000-0|Title|A Title",
+            f"{book}|978-3-319-00001-1|Title|B Title",
+        ]
+
+    assert capsys.readouterr().out == "\n".join(expected) + "\n"